@@ -0,0 +1,44 @@
+"""
+Measure the cold-start cost of importing tusur.
+
+Every statement runs in a fresh interpreter and the median time
+of the import itself is reported. ``eager`` imports what
+``tusur/__init__.py`` used to import before lazy loading.
+
+Usage:
+    python benchmarks/import_time.py [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "eager": "import tusur.session, tusur.sdo, bs4",
+    "import tusur": "import tusur",
+    "from tusur import Timetable": "from tusur import Timetable",
+    "from tusur import User": "from tusur import User",
+}
+
+CODE = ("import time; start = time.perf_counter(); {statement}; "
+        "print(time.perf_counter() - start)")
+
+
+def measure(statement: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", CODE.format(statement=statement)],
+            capture_output=True, text=True, check=True).stdout
+        timings.append(float(output))
+    return statistics.median(timings)
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for name, statement in STATEMENTS.items():
+        print(f"{name:<30} {measure(statement, runs) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import pytest
+import tusur
+
+
+def _run(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code],
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_import_is_lightweight():
+    code = ("import sys, tusur; "
+            "print(any(m in sys.modules for m in "
+            "('requests', 'bs4', 'tusur.session', 'tusur.sdo')))")
+    assert _run(code) == "False"
+
+
+def test_timetable_import_is_lightweight():
+    pytest.importorskip("requests")
+    code = ("import sys; from tusur import Timetable, Ocenka, User; "
+            "print(sorted(m for m in ('bs4', 'asyncio', 'sqlite3') "
+            "if m in sys.modules))")
+    assert _run(code) == "[]"
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        _ = tusur.DoesNotExist
+
+
+def test_dir_lists_lazy_attributes():
+    assert set(tusur.__all__) <= set(dir(tusur))
+    assert set(tusur.__all__) == set(tusur._LAZY_ATTRIBUTES)
@@ -0,0 +1,143 @@
+from tusur import Mirror
+
+TIMETABLE = [
+    {"day": "пн, 22 мая",
+     "lessons": [{"time": "08:50 10:25", "discipline": "ОРБД",
+                  "kind": "Лабораторная работа", "teacher": None}]},
+    {"day": "вт, 23 мая",
+     "lessons": [{"time": "10:40 12:15", "discipline": "МЛиТА",
+                  "kind": "Практика", "teacher": None}]},
+]
+
+
+def test_read_through_uses_stored_data(tmp_path):
+    calls = []
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+
+    def fetch(search_data, week_id):
+        calls.append((search_data, week_id))
+        return TIMETABLE
+
+    assert mirror.read_timetable("571-2", 666, fetch) == TIMETABLE
+    assert mirror.read_timetable("571-2", 666, fetch) == TIMETABLE
+    assert calls == [("571-2", 666)]
+
+
+def test_stale_data_is_refetched(tmp_path):
+    calls = []
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"), freshness={"user": -1})
+
+    def fetch(id):
+        calls.append(id)
+        return {"name": "Никита"}
+
+    mirror.read_user("user@example.com", 1, fetch)
+    mirror.read_user("user@example.com", 1, fetch)
+    assert calls == [1, 1]
+
+
+def test_shared_between_instances(tmp_path):
+    path = str(tmp_path / "tusur.sqlite3")
+    Mirror(path).read_timetable("571-2", None, lambda *args: TIMETABLE)
+    other = Mirror(path)
+    assert other.read_timetable("571-2", None, None) == TIMETABLE
+
+
+def test_lessons_query(tmp_path):
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+    mirror.read_timetable("571-2", 666, lambda *args: TIMETABLE)
+    lessons = mirror.lessons("571-2", day="вт, 23 мая")
+    assert [lesson["discipline"] for lesson in lessons] == ["МЛиТА"]
+    assert len(mirror.lessons("571-2")) == 2
+    assert mirror.lessons("571-1") == []
+
+
+def test_marks_query(tmp_path):
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+    for course in (2, 1):
+        mirror.read_marks("Исайченко", "Никита", "571-2", course,
+                          lambda *args: {"student": {}, "marks": [args[3]],
+                                         "available_courses": ["1", "2"]})
+    marks = mirror.marks("Исайченко", "Никита", "571-2")
+    assert [course["marks"] for course in marks] == [[1], [2]]
+    assert mirror.marks("Исайченко", "Никита", "571-2", 2) == [
+        {"course": 2, "student": {}, "semesters": None, "marks": [2],
+         "future_exam_session": None}]
+
+
+def test_empty_marks_are_not_stored(tmp_path):
+    calls = []
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+
+    def fetch(*args):
+        calls.append(args)
+        return {}
+
+    mirror.read_marks("Исайченко", "Никита", "571-2", 1, fetch)
+    mirror.read_marks("Исайченко", "Никита", "571-2", 1, fetch)
+    assert len(calls) == 2
+    assert mirror.marks("Исайченко", "Никита", "571-2") == []
+
+
+def test_participants_query(tmp_path):
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+    participant = dict(name="Никита", url="https://sdo.tusur.ru/user/1",
+                       role="Студент", groups="571-2", last_entry="now")
+    mirror.read_participants("user@example.com", 7, {"id": 7, "page": 0},
+                             lambda: [participant])
+    assert mirror.participants("user@example.com", 7) == [participant]
+    assert mirror.participants("user@example.com", 8) == []
+
+
+def test_accounts_do_not_share_entries(tmp_path):
+    calls = []
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+    participant = dict(name="Никита", url="https://sdo.tusur.ru/user/1",
+                       role="Студент", groups="571-2", last_entry="now")
+
+    def fetch_user(id):
+        calls.append(id)
+        return {"name": "Никита", "email": "hidden" if calls[1:] else "shown"}
+
+    first = mirror.read_user("first@example.com", 1, fetch_user)
+    second = mirror.read_user("second@example.com", 1, fetch_user)
+    assert (first["email"], second["email"]) == ("shown", "hidden")
+    mirror.read_participants("first@example.com", 7, {"id": 7},
+                             lambda: [participant])
+    assert mirror.participants("second@example.com", 7) == []
+    assert mirror.read_participants("second@example.com", 7, {"id": 7},
+                                    lambda: []) == []
+
+
+def test_current_week_lessons_query(tmp_path):
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+    mirror.read_timetable("571-2", None, lambda *args: TIMETABLE)
+    mirror.read_timetable("571-2", 666, lambda *args: TIMETABLE[:1])
+    assert len(mirror.lessons("571-2", week_id=None)) == 2
+    assert len(mirror.lessons("571-2", week_id=666)) == 1
+    assert len(mirror.lessons("571-2")) == 3
+
+
+def test_all_marks_are_indexed(tmp_path):
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"))
+    all_marks = {"student": {"group_number": "571-2"},
+                 "courses": [{"course": 1, "marks": [5]}]}
+    mirror.read_all_marks("Исайченко", "Никита", "571-2",
+                          lambda *args: all_marks)
+    assert mirror.marks("Исайченко", "Никита", "571-2", 1) == [
+        {"course": 1, "student": {"group_number": "571-2"},
+         "semesters": None, "marks": [5], "future_exam_session": None}]
+
+
+def test_removed_participants_disappear(tmp_path):
+    mirror = Mirror(str(tmp_path / "tusur.sqlite3"),
+                    freshness={"participants": -1})
+    first = dict(name="Никита", url="https://sdo.tusur.ru/user/1",
+                 role="Студент", groups="571-2", last_entry="now")
+    second = dict(first, name="Даниил", url="https://sdo.tusur.ru/user/2")
+    params = {"id": 7, "page": 0}
+    mirror.read_participants("user@example.com", 7, params,
+                             lambda: [first, second])
+    mirror.read_participants("user@example.com", 7, params,
+                             lambda: [first])
+    assert mirror.participants("user@example.com", 7) == [first]
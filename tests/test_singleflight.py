@@ -0,0 +1,232 @@
+import asyncio
+import threading
+import time
+
+import requests
+from tusur import Mirror, Ocenka, SingleFlight, Timetable
+
+GROUP_URL = "https://timetable.tusur.ru/faculties/fsu/groups/571-2"
+STUDENT_URL = "https://ocenka.tusur.ru/students/1"
+TIMETABLE_HTML = """
+<table class="table">
+  <thead><tr><th></th><th>пн, 22 мая</th></tr></thead>
+  <tbody>
+    <tr>
+      <th class="time">08:50 10:25</th>
+      <td>
+        <span class="discipline">ОРБД</span>
+        <span class="kind">Лабораторная работа</span>
+        <span class="group">Иванов И. И.</span>
+      </td>
+    </tr>
+  </tbody>
+</table>
+"""
+STUDENT_HTML = """<span class="js-role-token" data-role='{"context_id": 42}'>"""
+
+
+class FakeResponse:
+    def __init__(self, url: str, content: str = "", history: list = None,
+                 json: dict = None) -> None:
+        self.url = url
+        self.content = content.encode("utf-8")
+        self.history = history or []
+        self.status_code = 200
+        self.__json = json
+
+    def json(self) -> dict:
+        return self.__json
+
+
+def _collect(target, calls):
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target(*calls[i])
+
+    threads = [threading.Thread(target=worker, args=(i,))
+               for i in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_are_coalesced():
+    flight = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(10)
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return ["timetable"]
+
+    def worker():
+        barrier.wait()
+        results.append(flight.do(("timetable", "571-2"), fetch))
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [["timetable"]] * 10
+    assert flight.stats == dict(calls=10, executions=1, coalesced=9)
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats["executions"] == 2
+
+
+def test_error_is_shared():
+    flight = SingleFlight()
+    barrier = threading.Barrier(5)
+    errors = []
+
+    def fetch():
+        time.sleep(0.2)
+        raise ValueError()
+
+    def worker():
+        barrier.wait()
+        try:
+            flight.do("key", fetch)
+        except ValueError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 5
+    assert flight.stats == dict(calls=5, executions=1, coalesced=4)
+    assert flight.do("key", lambda: 1) == 1
+
+
+def test_reentrant_call_runs_directly():
+    flight = SingleFlight()
+
+    def outer():
+        return flight.do("key", lambda: "inner")
+
+    assert flight.do("key", outer) == "inner"
+    assert flight.stats == dict(calls=1, executions=1, coalesced=0)
+
+
+def test_reentrant_async_call_runs_directly():
+    flight = SingleFlight()
+
+    def outer():
+        return flight.do("key", lambda: "inner")
+
+    assert asyncio.run(flight.do_async("key", outer)) == "inner"
+
+
+def test_async_calls_are_coalesced():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"marks": []}
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("key", fetch)
+                                      for _ in range(5)))
+
+    assert asyncio.run(main()) == [{"marks": []}] * 5
+    assert len(calls) == 1
+    assert flight.stats == dict(calls=5, executions=1, coalesced=4)
+
+
+def _stub_session(monkeypatch):
+    """
+    Replace HTTP with canned TUSUR pages and record the requested URLs.
+    """
+    requested = []
+
+    def get(self, url, params=None, **kwargs):
+        requested.append(url)
+        if url == GROUP_URL or url.startswith("https://ocenka.tusur.ru/api"):
+            time.sleep(0.2)
+        if "common_search" in url:
+            return FakeResponse(GROUP_URL, history=[None])
+        if url == GROUP_URL:
+            return FakeResponse(url, TIMETABLE_HTML)
+        if "student_search" in url:
+            return FakeResponse(STUDENT_URL, history=[None])
+        if url == STUDENT_URL:
+            return FakeResponse(url, STUDENT_HTML)
+        return FakeResponse(url, json={"student": {},
+                                       "course": params["course"]})
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    return requested
+
+
+def test_timetable_arguments_are_normalized(monkeypatch):
+    requested = _stub_session(monkeypatch)
+    flight = SingleFlight()
+    timetable = Timetable(flight=flight)
+    results = _collect(timetable.get_timetable,
+                       [(" 571-2 ", "666"), ("571-2", 666)])
+    assert requested.count(GROUP_URL) == 1
+    assert flight.stats == dict(calls=2, executions=1, coalesced=1)
+    assert results[0] == results[1]
+    assert results[0] is not results[1]
+
+
+def test_marks_arguments_are_normalized(monkeypatch):
+    requested = _stub_session(monkeypatch)
+    flight = SingleFlight()
+    ocenka = Ocenka(flight=flight)
+    results = _collect(ocenka.get_marks_by_course,
+                       [("Исайченко ", "Никита", "571-2", "1"),
+                        ("Исайченко", " Никита", "571-2", 1)])
+    assert requested.count(STUDENT_URL) == 1
+    assert flight.stats["coalesced"] == 1
+    assert results == [{"student": {}, "course": 1}] * 2
+
+
+def test_each_mirror_stores_shared_result(monkeypatch, tmp_path):
+    requested = _stub_session(monkeypatch)
+    flight = SingleFlight()
+    first = Mirror(str(tmp_path / "first.sqlite3"))
+    second = Mirror(str(tmp_path / "second.sqlite3"))
+    _collect(lambda mirror: Timetable(mirror=mirror, flight=flight)
+             .get_timetable("571-2"), [(first,), (second,)])
+    assert requested.count(GROUP_URL) == 1
+    for mirror in (first, second):
+        assert [lesson["discipline"] for lesson
+                in mirror.lessons("571-2", week_id=None)] == ["ОРБД"]
+    Timetable(mirror=first, flight=flight).get_timetable("571-2")
+    assert requested.count(GROUP_URL) == 1
+    assert flight.stats["calls"] == 2
+
+
+def test_async_wrapped_library_call(monkeypatch):
+    requested = _stub_session(monkeypatch)
+    flight = SingleFlight()
+    timetable = Timetable(flight=flight)
+
+    async def main():
+        return await asyncio.gather(*(
+            flight.do_async(("timetable", "571-2", 666),
+                            timetable.get_timetable, "571-2", 666)
+            for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert requested.count(GROUP_URL) == 1
+    assert all(result == results[0] for result in results)
+    assert flight.stats == dict(calls=5, executions=1, coalesced=4)
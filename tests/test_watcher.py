@@ -0,0 +1,165 @@
+from tusur import Watcher
+
+
+def test_first_check_records_baseline():
+    watcher = Watcher()
+    watcher.watch("target", lambda: {"a": 1})
+    assert watcher.check("target", now=0) is None
+
+
+def test_change_emits_event():
+    data = {"marks": [1, 2]}
+    events = []
+    watcher = Watcher()
+    watcher.on_change(events.append)
+    watcher.watch("target", lambda: data)
+    watcher.check("target", now=0)
+    data = {"marks": [1, 3]}
+    event = watcher.check("target", now=1)
+    assert events == [event]
+    assert event["changes"] == [{"path": "marks[1]", "old": 2, "new": 3}]
+
+
+def test_key_order_is_not_a_change():
+    data = {"a": 1, "b": 2}
+    watcher = Watcher()
+    watcher.watch("target", lambda: data)
+    watcher.check("target", now=0)
+    data = {"b": 2, "a": 1}
+    assert watcher.check("target", now=1) is None
+
+
+def test_interval_backoff_and_exam_session():
+    data = {"future_exam_session": None}
+    watcher = Watcher(min_interval=10, max_interval=25, exam_interval=15)
+    watcher.watch("target", lambda: data)
+    watcher.check("target", now=0)
+    assert watcher.next_check() == 10
+    watcher.check("target", now=10)
+    assert watcher.next_check() == 30
+    watcher.check("target", now=30)
+    assert watcher.next_check() == 55
+    data = {"future_exam_session": {"start": "2024-06-01"}}
+    watcher.check("target", now=55)
+    watcher.check("target", now=65)
+    assert watcher.next_check() == 80
+
+
+def test_poll_skips_targets_not_due():
+    calls = []
+    watcher = Watcher(min_interval=10)
+    watcher.watch("target", lambda: calls.append(1) or len(calls))
+    watcher.poll(now=0)
+    watcher.poll(now=5)
+    assert len(calls) == 1
+
+
+def test_state_persists(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    watcher = Watcher(state_path=state_path)
+    watcher.watch("target", lambda: [1])
+    watcher.check("target", now=0)
+    restarted = Watcher(state_path=state_path)
+    restarted.watch("target", lambda: [2])
+    event = restarted.check("target", now=1)
+    assert event["changes"] == [{"path": "[0]", "old": 1, "new": 2}]
+
+
+def test_added_none_value_is_reported():
+    data = {"a": 1}
+    watcher = Watcher()
+    watcher.watch("target", lambda: data)
+    watcher.check("target", now=0)
+    data = {"a": 1, "b": None}
+    event = watcher.check("target", now=1)
+    assert event["changes"] == [{"path": "b", "new": None}]
+
+
+def test_mixed_keys_are_persisted(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    watcher = Watcher(state_path=state_path)
+    watcher.watch("target", lambda: {1: "a", "b": object})
+    watcher.check("target", now=0)
+    restarted = Watcher(state_path=state_path)
+    restarted.watch("target", lambda: {1: "a", "b": object})
+    assert restarted.check("target", now=1) is None
+
+
+def test_failed_callback_is_retried():
+    data = [1]
+    delivered = []
+
+    def callback(event):
+        if not delivered:
+            delivered.append(None)
+            raise ConnectionError()
+        delivered.append(event)
+
+    watcher = Watcher(min_interval=10)
+    watcher.on_change(callback)
+    watcher.watch("target", lambda: data)
+    watcher.check("target", now=0)
+    data = [2]
+    event = watcher.check("target", now=1)
+    assert watcher.poll(now=2) == []
+    assert delivered == [None, event]
+
+
+def test_broken_callback_does_not_block_others():
+    def broken(event):
+        raise ConnectionError()
+
+    data = [1]
+    delivered = []
+    watcher = Watcher(min_interval=1)
+    watcher.on_change(broken)
+    watcher.on_change(delivered.append)
+    watcher.watch("target", lambda: data)
+    watcher.poll(now=0)
+    data = [2]
+    for now in range(1, 6):
+        watcher.poll(now=now)
+    assert len(delivered) == 1
+    assert watcher.next_check() > 5
+
+
+def test_poll_survives_failed_target():
+    def fail():
+        raise ConnectionError()
+
+    watcher = Watcher(min_interval=10)
+    watcher.watch("broken", fail)
+    watcher.watch("target", lambda: [1])
+    assert watcher.poll(now=0) == []
+    watcher.poll(now=10)
+    assert watcher.next_check() == 20
+
+
+def test_exam_session_speeds_up_all_targets():
+    marks = {"future_exam_session": None}
+    watcher = Watcher(min_interval=10, max_interval=1000, exam_interval=15,
+                      backoff=10)
+    fetches = []
+    watcher.watch("timetable", lambda: fetches.append(1) or [1])
+    watcher.watch("marks", lambda: marks)
+    watcher.poll(now=0)
+    watcher.poll(now=10)
+    assert watcher.next_check() == 110
+    marks = {"future_exam_session": {"start": "2024-06-01"}}
+    watcher.check("marks", now=20)
+    watcher.poll(now=35)
+    assert len(fetches) == 3
+    assert watcher.next_check() == 50
+
+
+def test_failed_check_respects_exam_session():
+    def fail():
+        raise ConnectionError()
+
+    watcher = Watcher(min_interval=10, exam_interval=15, backoff=10)
+    watcher.watch("marks", lambda: {"future_exam_session": True})
+    watcher.watch("broken", fail)
+    watcher.poll(now=0)
+    assert watcher.next_check() == 10
+    watcher.poll(now=10)
+    assert watcher.next_check() == 15
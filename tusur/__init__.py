@@ -4,10 +4,54 @@
 :copyright: (c) 2024 Tarodictrl
 """
 
-from .session import Timetable, Ocenka
-from .sdo import Notifications, Messages, User
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __author__ = "Tarodictrl"
 __version__ = "0.3.3"
 __license__ = "MIT License"
 __email__ = "vudi600@gmail.com"
+
+# Public classes are resolved on first access (PEP 562), so that
+# ``import tusur`` does not pull in requests and bs4 up front.
+_LAZY_ATTRIBUTES = {
+    "Timetable": ".session",
+    "Ocenka": ".session",
+    "Notifications": ".sdo",
+    "Messages": ".sdo",
+    "User": ".sdo",
+    "Watcher": ".watcher",
+    "Mirror": ".mirror",
+    "SingleFlight": ".singleflight",
+}
+
+__all__ = [
+    "Timetable",
+    "Ocenka",
+    "Notifications",
+    "Messages",
+    "User",
+    "Watcher",
+    "Mirror",
+    "SingleFlight",
+]
+
+if TYPE_CHECKING:
+    from .session import Timetable, Ocenka
+    from .sdo import Notifications, Messages, User
+    from .watcher import Watcher
+    from .mirror import Mirror
+    from .singleflight import SingleFlight
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,380 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, List
+
+DEFAULT_FRESHNESS = {
+    "timetable": 3600,
+    "marks": 1800,
+    "all_marks": 1800,
+    "participants": 86400,
+    "user": 86400,
+}
+
+# Default of ``Mirror.lessons`` meaning "every stored week", as opposed
+# to ``None`` which is the current week.
+ANY_WEEK = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetches (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE TABLE IF NOT EXISTS lessons (
+    search_data TEXT NOT NULL,
+    week_id INTEGER,
+    day_index INTEGER NOT NULL,
+    day TEXT,
+    position INTEGER NOT NULL,
+    time TEXT,
+    discipline TEXT,
+    kind TEXT,
+    teacher TEXT
+);
+CREATE INDEX IF NOT EXISTS lessons_group_day
+    ON lessons (search_data, day);
+CREATE INDEX IF NOT EXISTS lessons_group_week
+    ON lessons (search_data, week_id);
+CREATE TABLE IF NOT EXISTS marks (
+    surname TEXT NOT NULL,
+    name TEXT NOT NULL,
+    student_group TEXT NOT NULL,
+    course INTEGER NOT NULL,
+    student TEXT,
+    semesters TEXT,
+    marks TEXT,
+    future_exam_session TEXT,
+    PRIMARY KEY (surname, name, student_group, course)
+);
+CREATE TABLE IF NOT EXISTS participants (
+    account TEXT NOT NULL,
+    course_id INTEGER NOT NULL,
+    fetch_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    name TEXT,
+    role TEXT,
+    groups TEXT,
+    last_entry TEXT,
+    PRIMARY KEY (account, course_id, fetch_key, url)
+);
+"""
+
+
+class Mirror:
+    def __init__(self, path: str = "tusur.sqlite3",
+                 freshness: dict = None, timeout: float = 30) -> None:
+        """
+        Initialize an instance of the Mirror class.
+
+        Args:
+            path (str, optional): Path of the SQLite database.
+                                  Default is "tusur.sqlite3".
+            freshness (dict, optional): Maximum age in seconds per data type
+                                        (timetable, marks, all_marks,
+                                        participants, user), merged into
+                                        DEFAULT_FRESHNESS.
+            timeout (float, optional): Seconds to wait for a lock held
+                                       by another process. Default is 30.
+
+        Example:
+            mirror = Mirror("tusur.sqlite3", freshness={"timetable": 600})
+            timetable = Timetable(mirror=mirror)
+        """
+        self.__path = path
+        self.__timeout = timeout
+        self.__freshness = {**DEFAULT_FRESHNESS, **(freshness or {})}
+        self.__local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Return the connection of the current thread, opening it if needed.
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.__path, timeout=self.__timeout)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.__local.connection = connection
+        return connection
+
+    @staticmethod
+    def __key(*args: Any) -> str:
+        return json.dumps(args, ensure_ascii=False)
+
+    @staticmethod
+    def __account(login: str) -> str:
+        """
+        Identify the account that fetched data visible only to it,
+        without storing the login itself.
+        """
+        return hashlib.sha256(login.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def __index_marks(connection: sqlite3.Connection, surname: str,
+                      name: str, group: str, student: Any,
+                      courses: List[dict]) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO marks (surname, name, student_group, "
+            "course, student, semesters, marks, future_exam_session) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(surname, name, group, course["course"],
+              *(json.dumps(value, ensure_ascii=False) for value in
+                (student, course.get("semesters"), course.get("marks"),
+                 course.get("future_exam_session"))))
+             for course in courses])
+
+    def __get(self, kind: str, key: str) -> Any:
+        """
+        Return the stored payload if it is still fresh, otherwise None.
+        """
+        row = self._connection().execute(
+            "SELECT payload, fetched_at FROM fetches "
+            "WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        if row is None or \
+                time.time() - row["fetched_at"] > self.__freshness[kind]:
+            return None
+        return json.loads(row["payload"])
+
+    def __read_through(self, kind: str, key: str, fetch: Callable[[], Any],
+                       index: Callable[[sqlite3.Connection, Any], None]
+                       = None) -> Any:
+        """
+        Return the fresh stored payload, or call ``fetch``
+        and store its result. Empty results, such as the ``{}`` Ocenka
+        returns for a failed request, are not stored.
+        """
+        payload = self.__get(kind, key)
+        if payload is not None:
+            return payload
+        payload = fetch()
+        if not payload:
+            return payload
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO fetches "
+                "(kind, key, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (kind, key, json.dumps(payload, ensure_ascii=False),
+                 time.time()))
+            if index is not None:
+                index(connection, payload)
+        return payload
+
+    def read_timetable(self, search_data: str, week_id: int,
+                       fetch: Callable[[str, int], list]) -> list:
+        """
+        Read a timetable through the mirror.
+
+        Args:
+            search_data (str): Search data for finding the timetable.
+            week_id (int): The week ID, or None for the current week.
+            fetch (Callable[[str, int], list]): Function fetching
+                                                the timetable on a miss.
+
+        Returns:
+            list: The timetable in the format of ``Timetable.get_timetable``.
+        """
+        def index(connection: sqlite3.Connection, timetable: list) -> None:
+            connection.execute(
+                "DELETE FROM lessons WHERE search_data = ? "
+                "AND week_id IS ?", (search_data, week_id))
+            connection.executemany(
+                "INSERT INTO lessons (search_data, week_id, day_index, day, "
+                "position, time, discipline, kind, teacher) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(search_data, week_id, day_index, day["day"], position,
+                  lesson["time"], lesson["discipline"], lesson["kind"],
+                  lesson["teacher"])
+                 for day_index, day in enumerate(timetable)
+                 for position, lesson in enumerate(day["lessons"])])
+
+        return self.__read_through("timetable",
+                                   self.__key(search_data, week_id),
+                                   lambda: fetch(search_data, week_id),
+                                   index)
+
+    def read_marks(self, surname: str, name: str, group: str, course: int,
+                   fetch: Callable[[str, str, str, int], dict]) -> dict:
+        """
+        Read marks of a student for a course through the mirror.
+
+        Args:
+            surname (str): Student's surname.
+            name (str): Student's name.
+            group (str): Student's group.
+            course (int): The course for which to retrieve marks.
+            fetch (Callable[[str, str, str, int], dict]): Function fetching
+                                                          the marks on a miss.
+
+        Returns:
+            dict: The marks in the format of ``Ocenka.get_marks_by_course``.
+        """
+        def index(connection: sqlite3.Connection, marks: dict) -> None:
+            self.__index_marks(connection, surname, name, group,
+                               marks.get("student"),
+                               [dict(marks, course=course)])
+
+        return self.__read_through("marks",
+                                   self.__key(surname, name, group, course),
+                                   lambda: fetch(surname, name, group,
+                                                 course),
+                                   index)
+
+    def read_all_marks(self, surname: str, name: str, group: str,
+                       fetch: Callable[[str, str, str], dict]) -> dict:
+        """
+        Read all marks of a student through the mirror.
+
+        Returns:
+            dict: The marks in the format of ``Ocenka.get_all_marks``.
+        """
+        def index(connection: sqlite3.Connection, all_marks: dict) -> None:
+            self.__index_marks(connection, surname, name, group,
+                               all_marks.get("student"),
+                               all_marks.get("courses") or [])
+
+        return self.__read_through("all_marks",
+                                   self.__key(surname, name, group),
+                                   lambda: fetch(surname, name, group),
+                                   index)
+
+    def read_participants(self, login: str, id: int, params: dict,
+                          fetch: Callable[[], list]) -> list:
+        """
+        Read participants of a course through the mirror.
+        Listings are kept per account, since what SDO shows depends
+        on the viewer. The participants stored for the same parameters
+        are replaced, so people removed from the course disappear from
+        ``participants`` once every listing they were in is refreshed.
+
+        Args:
+            login (str): Login of the account fetching the listing.
+            id (int): The course ID.
+            params (dict): All request parameters, used as the mirror key.
+            fetch (Callable[[], list]): Function fetching
+                                        the participants on a miss.
+
+        Returns:
+            list: The participants in the format
+                  of ``User.get_participants``.
+        """
+        account = self.__account(login)
+        key = json.dumps(params, ensure_ascii=False, sort_keys=True)
+
+        def index(connection: sqlite3.Connection,
+                  participants: list) -> None:
+            connection.execute(
+                "DELETE FROM participants WHERE account = ? "
+                "AND course_id = ? AND fetch_key = ?", (account, id, key))
+            connection.executemany(
+                "INSERT OR REPLACE INTO participants (account, course_id, "
+                "fetch_key, url, name, role, groups, last_entry) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(account, id, key, p["url"], p["name"], p["role"],
+                  p["groups"], p["last_entry"]) for p in participants])
+
+        return self.__read_through("participants",
+                                   self.__key(account, key), fetch, index)
+
+    def read_user(self, login: str, id: int,
+                  fetch: Callable[[int], dict]) -> dict:
+        """
+        Read a user profile through the mirror.
+        Profiles are kept per account, since visible fields
+        depend on the viewer.
+
+        Args:
+            login (str): Login of the account fetching the profile.
+            id (int): The user ID.
+            fetch (Callable[[int], dict]): Function fetching
+                                           the profile on a miss.
+
+        Returns:
+            dict: The profile in the format of ``User.get_user``.
+        """
+        return self.__read_through("user",
+                                   self.__key(self.__account(login), id),
+                                   lambda: fetch(id))
+
+    def lessons(self, group: str, day: str = None,
+                week_id: int = ANY_WEEK) -> List[dict]:
+        """
+        Query stored lessons without touching the network.
+
+        Args:
+            group (str): The search data the timetable was fetched with.
+            day (str, optional): The day, e.g. "пн, 22 мая".
+            week_id (int, optional): The week ID, or None for the
+                                     timetable fetched without one.
+                                     Default is ANY_WEEK (all stored weeks).
+
+        Returns:
+            List[dict]: Lessons with ``week_id``, ``day``, ``time``,
+                        ``discipline``, ``kind`` and ``teacher`` keys.
+        """
+        query = ("SELECT week_id, day, time, discipline, kind, teacher "
+                 "FROM lessons WHERE search_data = ?")
+        args = [group]
+        if day is not None:
+            query += " AND day = ?"
+            args.append(day)
+        if week_id is not ANY_WEEK:
+            query += " AND week_id IS ?"
+            args.append(week_id)
+        query += " ORDER BY week_id, day_index, position"
+        rows = self._connection().execute(query, args).fetchall()
+        return [dict(row) for row in rows]
+
+    def marks(self, surname: str, name: str, group: str,
+              course: int = None) -> List[dict]:
+        """
+        Query stored marks without touching the network.
+
+        Args:
+            surname (str): Student's surname.
+            name (str): Student's name.
+            group (str): Student's group.
+            course (int, optional): The course. Default is None (all courses).
+
+        Returns:
+            List[dict]: Courses ordered by course, each with ``course``,
+                        ``student``, ``semesters``, ``marks`` and
+                        ``future_exam_session`` keys, whether they were
+                        fetched by ``Ocenka.get_marks_by_course``
+                        or ``Ocenka.get_all_marks``.
+        """
+        query = ("SELECT course, student, semesters, marks, "
+                 "future_exam_session FROM marks WHERE surname = ? "
+                 "AND name = ? AND student_group = ?")
+        args = [surname, name, group]
+        if course is not None:
+            query += " AND course = ?"
+            args.append(course)
+        query += " ORDER BY course"
+        rows = self._connection().execute(query, args).fetchall()
+        return [{key: row[key] if key == "course" else json.loads(row[key])
+                 for key in row.keys()} for row in rows]
+
+    def participants(self, login: str, id: int) -> List[dict]:
+        """
+        Query stored participants of a course without touching the network.
+
+        Args:
+            login (str): Login of the account the listing was fetched with.
+            id (int): The course ID.
+
+        Returns:
+            List[dict]: Participants in the format
+                        of ``User.get_participants``.
+        """
+        rows = self._connection().execute(
+            "SELECT name, url, role, groups, last_entry FROM participants "
+            "WHERE account = ? AND course_id = ? GROUP BY url ORDER BY name",
+            (self.__account(login), id)).fetchall()
+        return [dict(row) for row in rows]
@@ -1,13 +1,15 @@
 import re
-from typing import List
-
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, List
 
 from tusur.exceptions import TusurError
 from .authorization import Auth
 from .ajax import Ajax
 from .constants import NOTIFICATIONS_URL, USER_INDEX_URL, USER_VIEW_URL
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from .mirror import Mirror
+
 
 class Notifications(Auth):
     def __init__(self, login: str, password: str) -> None:
@@ -97,15 +99,20 @@ class Messages(Auth):
 
 class User(Auth):
 
-    def __init__(self, login: str, password: str) -> None:
+    def __init__(self, login: str, password: str,
+                 mirror: "Mirror" = None) -> None:
         """
         Initialize an instance of the User class.
 
         Args:
             login (str): The user's login/email.
             password (str): The user's password.
+            mirror (Mirror, optional): Local mirror to read through.
+                                       Default is None.
         """
         super().__init__(login, password)
+        self.__login = login
+        self.__mirror = mirror
 
     def __get_content(self, url: str, params: dict) -> bytes:
         response = self._session.get(url=url, params=params)
@@ -113,7 +120,7 @@ class User(Auth):
             raise TusurError("Хуй знает")
         return response.content
 
-    def __parse_user(self, soup: BeautifulSoup) -> dict:
+    def __parse_user(self, soup: "BeautifulSoup") -> dict:
         name = soup.find("div", class_="page-header-headings").text
         card = soup.find("div", class_="card-body")
         contentnode = card.find_all("li", class_="contentnode")
@@ -125,7 +132,7 @@ class User(Auth):
         return dict(name=name, email=email, country=country, town=town,
                     time_zone=time_zone, groups=groups)
 
-    def __parse_participants(self, soup: BeautifulSoup) -> list[dict]:
+    def __parse_participants(self, soup: "BeautifulSoup") -> list[dict]:
         table = soup.find("table", id="participants")
         rows = table.find_all("tr", id=re.compile("^user-index"))
         participants = []
@@ -150,11 +157,27 @@ class User(Auth):
                          page: int = 0) -> dict:
         params = dict(id=id, tifirst=tifirst, tilast=tilast,
                       perpage=perpage, page=page)
+        if self.__mirror is not None:
+            return self.__mirror.read_participants(
+                self.__login, id, params, lambda: self.__fetch_participants(params))
+        return self.__fetch_participants(params)
+
+    def __fetch_participants(self, params: dict) -> list:
+        from bs4 import BeautifulSoup
+
         content = self.__get_content(url=USER_INDEX_URL, params=params)
         soup = BeautifulSoup(content, "html.parser")
         return self.__parse_participants(soup)
 
     def get_user(self, id: int) -> dict:
+        if self.__mirror is not None:
+            return self.__mirror.read_user(self.__login, id,
+                                           self.__fetch_user)
+        return self.__fetch_user(id)
+
+    def __fetch_user(self, id: int) -> dict:
+        from bs4 import BeautifulSoup
+
         params = dict(id=id)
         content = self.__get_content(url=USER_VIEW_URL, params=params)
         soup = BeautifulSoup(content, "html.parser")
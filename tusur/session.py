@@ -1,22 +1,37 @@
 import requests
 import json
+from typing import TYPE_CHECKING
 
 from requests import Response
-from bs4 import BeautifulSoup
 from .exceptions import TimetableNotFound, StudentNotFound
+from .singleflight import SingleFlight, default_flight
 from .constants import (
     COMMON_SEARCH_URL,
     STUDENT_MARKS_URL,
     STUDENT_SEARCH_URL
 )
 
+if TYPE_CHECKING:
+    from .mirror import Mirror
+
 
 class Timetable:
-    def __init__(self) -> None:
+    def __init__(self, mirror: "Mirror" = None,
+                 flight: SingleFlight = None) -> None:
         """
         Initialize an instance of the Timetable class.
+
+        Args:
+            mirror (Mirror, optional): Local mirror to read through.
+                                       Default is None.
+            flight (SingleFlight, optional): Group coalescing concurrent
+                                             identical lookups. Default is
+                                             the group shared by all
+                                             instances.
         """
         self.__session = requests.session()
+        self.__mirror = mirror
+        self.__flight = flight or default_flight
 
     def __get_timetable_url(self, search_data: int) -> str:
         """
@@ -63,6 +78,8 @@ class Timetable:
 
     @staticmethod
     def __parse_group(response: str, group: str) -> str | None:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(response, "html.parser")
         ul = soup.find("ul", class_="list-inline")
         for a in ul.find_all("a"):
@@ -83,6 +100,8 @@ class Timetable:
         Example:
             parsed_timetable = self.__parse_timetable(response)
         """
+        from bs4 import BeautifulSoup
+
         timetable = []
         soup = BeautifulSoup(response.content, "html.parser")
         table = soup.find("table", class_="table")
@@ -126,6 +145,18 @@ class Timetable:
         Example:
             timetable = self.get_timetable("search_data_here", week_id=2)
         """
+        search_data = str(search_data).strip()
+        week_id = None if week_id is None else int(week_id)
+        if self.__mirror is not None:
+            return self.__mirror.read_timetable(search_data, week_id,
+                                                self.__coalesce_timetable)
+        return self.__coalesce_timetable(search_data, week_id)
+
+    def __coalesce_timetable(self, search_data: str, week_id: int) -> list:
+        return self.__flight.do(("timetable", search_data, week_id),
+                                self.__fetch_timetable, search_data, week_id)
+
+    def __fetch_timetable(self, search_data: str, week_id: int) -> list:
         timetable_url: str = self.__get_timetable_url(search_data=search_data)
         timetable: Response = self.__session.get(url=timetable_url,
                                                  params={"week_id": week_id})
@@ -134,11 +165,22 @@ class Timetable:
 
 
 class Ocenka:
-    def __init__(self) -> None:
+    def __init__(self, mirror: "Mirror" = None,
+                 flight: SingleFlight = None) -> None:
         """
         Initialize an instance of the Ocenka class.
+
+        Args:
+            mirror (Mirror, optional): Local mirror to read through.
+                                       Default is None.
+            flight (SingleFlight, optional): Group coalescing concurrent
+                                             identical lookups. Default is
+                                             the group shared by all
+                                             instances.
         """
         self.__session = requests.session()
+        self.__mirror = mirror
+        self.__flight = flight or default_flight
 
     def __get_student_url(self, surname: str, name: str, group: str) -> str:
         """
@@ -181,6 +223,8 @@ class Ocenka:
         Example:
             context_id = self.__get_context_id(response)
         """
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(response.content, "html.parser")
         js_role_token = soup.find("span", class_="js-role-token")
         context_id = json.loads(js_role_token.get("data-role"))["context_id"]
@@ -227,6 +271,18 @@ class Ocenka:
         Example:
             all_marks = self.get_all_marks("Smith", "John", "GroupA")
         """
+        surname, name, group = surname.strip(), name.strip(), group.strip()
+        if self.__mirror is not None:
+            return self.__mirror.read_all_marks(surname, name, group,
+                                                self.__coalesce_all_marks)
+        return self.__coalesce_all_marks(surname, name, group)
+
+    def __coalesce_all_marks(self, surname: str, name: str,
+                             group: str) -> dict:
+        return self.__flight.do(("all_marks", surname, name, group),
+                                self.__fetch_all_marks, surname, name, group)
+
+    def __fetch_all_marks(self, surname: str, name: str, group: str) -> dict:
         student_url: str = self.__get_student_url(surname=surname,
                                                   name=name,
                                                   group=group)
@@ -269,6 +325,21 @@ class Ocenka:
         Example:
             course_marks = self.get_marks_by_course("Smith", "John", "GroupA", 1)
         """
+        surname, name, group = surname.strip(), name.strip(), group.strip()
+        course = int(course)
+        if self.__mirror is not None:
+            return self.__mirror.read_marks(surname, name, group, course,
+                                            self.__coalesce_marks_by_course)
+        return self.__coalesce_marks_by_course(surname, name, group, course)
+
+    def __coalesce_marks_by_course(self, surname: str, name: str,
+                                   group: str, course: int) -> dict:
+        return self.__flight.do(("marks", surname, name, group, course),
+                                self.__fetch_marks_by_course,
+                                surname, name, group, course)
+
+    def __fetch_marks_by_course(self, surname: str, name: str,
+                                group: str, course: int) -> dict:
         student_url: str = self.__get_student_url(surname=surname,
                                                   name=name,
                                                   group=group)
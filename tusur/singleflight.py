@@ -0,0 +1,127 @@
+import copy
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.leader = threading.get_ident()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """
+        Initialize an instance of the SingleFlight class.
+
+        Concurrent calls with the same key share one execution
+        and all receive its result or its exception. Callers that joined
+        a call receive a deep copy, so modifying a result in place
+        does not affect the others.
+        """
+        self.__lock = threading.Lock()
+        self.__calls = {}
+        self.__futures = {}
+        self.__stats = dict(calls=0, executions=0, coalesced=0)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Counters ``calls``, ``executions`` and ``coalesced``.
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+    def do(self, key: Hashable, fn: Callable[..., Any],
+           *args: Any, **kwargs: Any) -> Any:
+        """
+        Call ``fn(*args, **kwargs)`` unless a call with the same key
+        is already in flight, in which case wait for it and share its result.
+        A nested call with the same key from the thread running the call
+        is executed directly instead of waiting on itself, and is not
+        counted in ``stats``.
+
+        Args:
+            key (Hashable): Normalized arguments identifying the call.
+            fn (Callable[..., Any]): The function to call.
+
+        Returns:
+            Any: The result of the shared call.
+
+        Example:
+            flight.do(("page", url), fetch_page, url)
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            reentrant = not leader and call.leader == threading.get_ident()
+            if not reentrant:
+                self.__stats["calls"] += 1
+            if leader:
+                call = self.__calls[key] = _Call()
+                self.__stats["executions"] += 1
+            elif not reentrant:
+                self.__stats["coalesced"] += 1
+        if reentrant:
+            return fn(*args, **kwargs)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+        return call.result
+
+    def __forget_future(self, loop: "asyncio.AbstractEventLoop",
+                        key: Hashable) -> None:
+        with self.__lock:
+            self.__futures.pop((loop, key), None)
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Any],
+                       *args: Any, **kwargs: Any) -> Any:
+        """
+        Asyncio counterpart of ``do``. The blocking ``fn`` runs in the
+        default executor, and it is coalesced with both coroutines
+        and threads calling with the same key.
+
+        Args:
+            key (Hashable): Normalized arguments identifying the call.
+            fn (Callable[..., Any]): The blocking function to call.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self.__lock:
+            future = self.__futures.get((loop, key))
+            joined = future is not None
+            if joined:
+                self.__stats["calls"] += 1
+                self.__stats["coalesced"] += 1
+            else:
+                future = loop.run_in_executor(
+                    None, lambda: self.do(key, fn, *args, **kwargs))
+                self.__futures[(loop, key)] = future
+                future.add_done_callback(
+                    lambda _: self.__forget_future(loop, key))
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result) if joined else result
+
+
+default_flight = SingleFlight()
@@ -0,0 +1,369 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class Watcher:
+    def __init__(self, state_path: str = None, min_interval: float = 300,
+                 max_interval: float = 86400, exam_interval: float = 900,
+                 backoff: float = 2.0) -> None:
+        """
+        Initialize an instance of the Watcher class.
+
+        Args:
+            state_path (str, optional): Path of the JSON file used to keep
+                                        fingerprints between restarts.
+                                        Default is None (memory only).
+            min_interval (float, optional): Polling interval in seconds
+                                            right after a change.
+            max_interval (float, optional): Upper bound for the polling
+                                            interval of a stable target.
+            exam_interval (float, optional): Upper bound for the polling
+                                             interval of every target while
+                                             any marks target announces
+                                             an exam session.
+            backoff (float, optional): Factor the interval is multiplied by
+                                       after every check without changes.
+        """
+        self.__state_path = state_path
+        self.__min_interval = min_interval
+        self.__max_interval = max_interval
+        self.__exam_interval = exam_interval
+        self.__backoff = backoff
+        self.__targets = {}
+        self.__callbacks = []
+        self.__pending = {}
+        self.__state = self.__load_state()
+
+    def __load_state(self) -> dict:
+        if self.__state_path is None or \
+                not os.path.exists(self.__state_path):
+            return {}
+        with open(self.__state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def __save_state(self) -> None:
+        if self.__state_path is None:
+            return
+        tmp_path = self.__state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.__state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.__state_path)
+
+    @classmethod
+    def _canonical(cls, data: Any) -> Any:
+        """
+        Convert data to the form it is fingerprinted, compared and stored in:
+        dictionary keys become strings, tuples become lists and other
+        values that JSON cannot represent become their ``str``.
+
+        Args:
+            data (Any): Fetched data.
+
+        Returns:
+            Any: JSON-serializable data.
+        """
+        if isinstance(data, dict):
+            return {str(key): cls._canonical(value)
+                    for key, value in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [cls._canonical(value) for value in data]
+        if data is None or isinstance(data, (str, int, float, bool)):
+            return data
+        return str(data)
+
+    @staticmethod
+    def _fingerprint(data: Any) -> str:
+        """
+        Compute a fingerprint that only depends on the structure and values
+        of the data, not on the order of dictionary keys.
+
+        Args:
+            data (Any): Data returned by ``_canonical``.
+
+        Returns:
+            str: Hex digest of the canonical JSON representation.
+        """
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _diff(cls, old: Any, new: Any, path: str = "") -> List[dict]:
+        """
+        Compare two values structurally.
+
+        Args:
+            old (Any): Previously observed value.
+            new (Any): Freshly fetched value.
+            path (str, optional): Path of the compared values.
+
+        Returns:
+            List[dict]: Changed leaves as dictionaries with ``path``,
+                        ``old`` and ``new`` keys. ``old`` is left out
+                        for added values and ``new`` for removed ones.
+
+        Example:
+            Watcher._diff({"a": [1, 2]}, {"a": [1, 3]})
+            # [{"path": "a[1]", "old": 2, "new": 3}]
+        """
+        if isinstance(old, dict) and isinstance(new, dict):
+            changes = []
+            for key in sorted(set(old) | set(new), key=str):
+                key_path = f"{path}.{key}" if path else str(key)
+                changes += cls._diff(old.get(key, _MISSING),
+                                     new.get(key, _MISSING), key_path)
+            return changes
+        if isinstance(old, list) and isinstance(new, list):
+            changes = []
+            for i in range(max(len(old), len(new))):
+                changes += cls._diff(old[i] if i < len(old) else _MISSING,
+                                     new[i] if i < len(new) else _MISSING,
+                                     f"{path}[{i}]")
+            return changes
+        if old == new:
+            return []
+        change = dict(path=path)
+        if old is not _MISSING:
+            change["old"] = old
+        if new is not _MISSING:
+            change["new"] = new
+        return [change]
+
+    @staticmethod
+    def _in_exam_session(data: Any) -> bool:
+        """
+        Check whether the fetched marks announce an upcoming exam session.
+
+        Args:
+            data (Any): Result of ``Ocenka.get_marks_by_course``
+                        or ``Ocenka.get_all_marks``.
+
+        Returns:
+            bool: True if any ``future_exam_session`` field is filled.
+        """
+        if not isinstance(data, dict):
+            return False
+        if data.get("future_exam_session"):
+            return True
+        return any(isinstance(course, dict) and
+                   course.get("future_exam_session")
+                   for course in data.get("courses") or [])
+
+    def watch(self, name: str, fetch: Callable[[], Any]) -> None:
+        """
+        Register a target to be polled.
+
+        Args:
+            name (str): Unique name of the target, used as the state key.
+            fetch (Callable[[], Any]): Function returning
+                                       the current JSON-serializable data.
+
+        Example:
+            watcher.watch("timetable", lambda: timetable.get_timetable("571-2"))
+        """
+        self.__targets[name] = fetch
+        self.__state.setdefault(name, {
+            "fingerprint": None,
+            "data": None,
+            "interval": self.__min_interval,
+            "next_check": 0,
+        })
+
+    def watch_timetable(self, timetable, search_data: str,
+                        week_id: int = None) -> str:
+        """
+        Register ``Timetable.get_timetable`` as a target.
+
+        Returns:
+            str: The name of the registered target.
+        """
+        name = f"timetable:{search_data}:{week_id}"
+        self.watch(name, lambda: timetable.get_timetable(search_data,
+                                                         week_id=week_id))
+        return name
+
+    def watch_marks(self, ocenka, surname: str, name: str,
+                    group: str, course: int) -> str:
+        """
+        Register ``Ocenka.get_marks_by_course`` as a target.
+
+        Returns:
+            str: The name of the registered target.
+        """
+        target = f"marks:{surname}:{name}:{group}:{course}"
+        self.watch(target, lambda: ocenka.get_marks_by_course(surname, name,
+                                                              group, course))
+        return target
+
+    def on_change(self, callback: Callable[[dict], None]) -> None:
+        """
+        Register a callback invoked with every change event.
+        Events a callback failed on are logged and retried, in order,
+        on the next ``poll`` without affecting other callbacks.
+
+        Args:
+            callback (Callable[[dict], None]): The function to call.
+        """
+        self.__callbacks.append(callback)
+        self.__pending[callback] = []
+
+    def __flush(self, callback: Callable[[dict], None]) -> None:
+        """
+        Deliver the pending events of a callback until one fails.
+        """
+        pending = self.__pending[callback]
+        while pending:
+            try:
+                callback(pending[0])
+            except Exception:
+                logger.exception("Failed to deliver event of target %s",
+                                 pending[0]["target"])
+                return
+            pending.pop(0)
+
+    def __deliver(self, event: dict) -> None:
+        for callback in self.__callbacks:
+            self.__pending[callback].append(event)
+            self.__flush(callback)
+
+    def __exam_session(self) -> bool:
+        return any(self.__state[name].get("exam_session")
+                   for name in self.__targets)
+
+    def __cap(self, interval: float) -> float:
+        """
+        Limit an interval by max_interval, and by exam_interval
+        during an exam session.
+        """
+        interval = min(interval, self.__max_interval)
+        if self.__exam_session():
+            interval = min(interval, self.__exam_interval)
+        return interval
+
+    def add_webhook(self, url: str, timeout: float = 10) -> None:
+        """
+        POST every change event as JSON to the provided URL.
+
+        Args:
+            url (str): The webhook URL.
+            timeout (float, optional): Request timeout in seconds.
+        """
+        import requests
+
+        def send(event: dict) -> None:
+            response = requests.post(url, json=event, timeout=timeout)
+            response.raise_for_status()
+
+        self.on_change(send)
+
+    def check(self, name: str, now: float = None) -> dict | None:
+        """
+        Fetch a target, compare it with the last observation
+        and emit an event if it changed.
+
+        Args:
+            name (str): The name of the target.
+            now (float, optional): Current timestamp. Default is time.time().
+
+        Returns:
+            dict | None: The emitted event, or None if nothing changed.
+                         The first observation of a target only records
+                         a baseline and emits nothing.
+
+        Raises:
+            Exception: Whatever the fetch raised.
+        """
+        now = time.time() if now is None else now
+        data = self._canonical(self.__targets[name]())
+        state = self.__state[name]
+        fingerprint = self._fingerprint(data)
+        event = None
+        if fingerprint == state["fingerprint"]:
+            interval = state["interval"] * self.__backoff
+        else:
+            if state["fingerprint"] is not None:
+                event = dict(target=name,
+                             fingerprint=fingerprint,
+                             previous_fingerprint=state["fingerprint"],
+                             changes=self._diff(state["data"], data),
+                             data=data,
+                             detected_at=now)
+            interval = self.__min_interval
+        exam_session = self.__exam_session()
+        state["exam_session"] = self._in_exam_session(data)
+        if state["exam_session"] and not exam_session:
+            for other in self.__targets:
+                other_state = self.__state[other]
+                other_state["interval"] = min(other_state["interval"],
+                                              self.__exam_interval)
+                other_state["next_check"] = min(other_state["next_check"],
+                                                now + self.__exam_interval)
+        interval = self.__cap(interval)
+        state.update(fingerprint=fingerprint, data=data, interval=interval,
+                     next_check=now + interval)
+        self.__save_state()
+        if event is not None:
+            self.__deliver(event)
+        return event
+
+    def __postpone(self, name: str, now: float) -> None:
+        """
+        Back off a target whose check failed, keeping its last observation.
+        """
+        state = self.__state[name]
+        state["interval"] = self.__cap(state["interval"] * self.__backoff)
+        state["next_check"] = now + state["interval"]
+        self.__save_state()
+
+    def poll(self, now: float = None) -> List[dict]:
+        """
+        Check every target whose polling interval has elapsed.
+        A failed check is logged and the target is backed off
+        without affecting the others.
+
+        Args:
+            now (float, optional): Current timestamp. Default is time.time().
+
+        Returns:
+            List[dict]: The emitted events.
+        """
+        now = time.time() if now is None else now
+        for callback in self.__callbacks:
+            self.__flush(callback)
+        events = []
+        for name in self.__targets:
+            if self.__state[name]["next_check"] > now:
+                continue
+            try:
+                event = self.check(name, now=now)
+            except Exception:
+                logger.exception("Failed to check target %s", name)
+                self.__postpone(name, now)
+                continue
+            if event is not None:
+                events.append(event)
+        return events
+
+    def next_check(self) -> float:
+        """
+        Returns:
+            float: Timestamp of the earliest scheduled check.
+        """
+        return min((self.__state[name]["next_check"]
+                    for name in self.__targets), default=time.time())
+
+    def run(self) -> None:
+        """
+        Poll the registered targets forever, sleeping until the next
+        target is due.
+        """
+        while True:
+            self.poll()
+            time.sleep(max(0, self.next_check() - time.time()))